@@ -1,6 +1,12 @@
 import pulp
 import time
 import random
+import hashlib
+import json
+import math
+import os
+import tempfile
+from collections import OrderedDict
 
 # 母材の長さ
 L = 1570
@@ -12,9 +18,6 @@ lengths = [100, 70, 53, 45, 27, 25, 23]
 def generate_required_quantities():
     return [random.randint(1, 500) for _ in lengths]
 
-# 必要数量の生成
-required_quantities = generate_required_quantities()
-
 # 最大母材数の仮定
 N = 500
 
@@ -30,189 +33,361 @@ def calculate_excess_material(cut_materials, required_quantities, lengths):
             excess_length += (cut_materials[i] - required_quantities[i]) * lengths[i]
     return excess_length
 
-# ステップ1: 母材枚数最小化問題の定義
-prob1 = pulp.LpProblem("Minimize_Number_of_Raw_Materials", pulp.LpMinimize)
-
-# 変数の定義
-x = pulp.LpVariable.dicts("x", ((i, j) for i in range(len(lengths)) for j in range(N)), lowBound=0, cat='Integer')
-y = pulp.LpVariable.dicts("y", (j for j in range(N)), cat='Binary')
-
-# 目的関数の設定
-prob1 += pulp.lpSum([y[j] for j in range(N)]), "Minimize_Total_Raw_Materials"
-
-# 制約1: 各材料の要求本数を満たす
-for i in range(len(lengths)):
-    prob1 += pulp.lpSum([x[(i, j)] for j in range(N)]) >= required_quantities[i], f"Demand_Constraint_{i}"
-
-# 制約2: 母材の長さ制約
-for j in range(N):
-    prob1 += pulp.lpSum([lengths[i] * x[(i, j)] for i in range(len(lengths))]) <= L * y[j], f"Length_Constraint_{j}"
-
-# 初期解の導出時間を計測
-start_time_initial = time.time()
-prob1.solve(pulp.PULP_CBC_CMD(msg=True))  # CBCソルバーを使用
-end_time_initial = time.time()
-
-# ステップ1の結果の出力
-used_patterns = []
-pattern_counts = {}
-total_cut_material_length_initial = 0
-total_waste_length = 0
-
-# 検算用の初期解での切り出し結果
-cut_materials_initial = [0] * len(lengths)
-
-# 初期解のパターンと利用回数を集計
-for j in range(N):
-    if y[j].varValue > 0:
-        pattern = tuple(int(x[(i, j)].varValue) for i in range(len(lengths)))
-        if pattern in pattern_counts:
-            pattern_counts[pattern] += 1
-        else:
-            pattern_counts[pattern] = 1
-            used_patterns.append(pattern)
-
-# 各パターンの端切れ長を計算し、パターンごとに保存
-for pattern, count in pattern_counts.items():
-    waste_length = calculate_waste(pattern, lengths, L)
-    total_waste_length += waste_length * count
-    total_cut_material_length_initial += sum(pattern[i] * lengths[i] for i in range(len(pattern))) * count
-
-    # 検算のため、切り出された材料の数量を集計
-    for i in range(len(lengths)):
-        cut_materials_initial[i] += pattern[i] * count
-
-# 初期解の母材数と端材の長さ
-initial_material_count = sum(pattern_counts.values())
-
-# 初期解の余分な切断材料の総長さ
-total_excess_cut_material_length_initial = calculate_excess_material(cut_materials_initial, required_quantities, lengths)
-
-# 最も少ない母材数と端材長さを保存する変数
-best_material_count = float('inf')
-best_waste_length = float('inf')
-best_pattern_counts = {}
-best_cut_materials_final = []
-best_excess_cut_material_length = 0
-
-# パターン数の上限を初期解から段階的に減らしていく
-start_time_final_optimization = time.time()  # 最終解の最適化プロセス開始時間
-for k in range(len(used_patterns), 0, -1):
-    print(f"\n\nパターン数の上限を {k} に設定して最適化を実行中...")
-
-    # 新しい問題の定義 (ステップ2: パターン数制限付き最適化)
-    prob2 = pulp.LpProblem(f"Minimize_Number_of_Raw_Materials_with_Limited_Patterns_k={k}", pulp.LpMinimize)
+# パターンの利用回数から母材数・端材長さ・切り出し数量・余分な切断材料の長さを集計する関数
+def summarize_pattern_counts(pattern_counts, required_quantities, lengths, total_length):
+    total_waste = 0
+    cut_materials = [0] * len(lengths)
+    for pattern, count in pattern_counts.items():
+        total_waste += calculate_waste(pattern, lengths, total_length) * count
+        for i in range(len(lengths)):
+            cut_materials[i] += pattern[i] * count
+    material_count = sum(pattern_counts.values())
+    excess_length = calculate_excess_material(cut_materials, required_quantities, lengths)
+    return material_count, total_waste, cut_materials, excess_length
+
+# 目的関数・モデルの設定（キャッシュキーに含める）
+OBJECTIVE_SETTINGS = {
+    "max_raw_materials": N,
+    "pattern_big_m": 1000,
+}
+
+# 計画キャッシュの設定
+PLAN_CACHE_DIR = "plan_cache"                 # ディスクキャッシュの保存先
+PLAN_CACHE_MAX_BYTES = 10 * 1024 * 1024       # ディスクキャッシュの上限サイズ
+PLAN_CACHE_MEMORY_SIZE = 128                  # メモリ上のLRUキャッシュの件数
+
+# メモリ上のLRUキャッシュ: (基本キー, 倍数) -> (初期解のパターン, 最終解のパターン)
+plan_cache_memory = OrderedDict()
+
+# 注文を正規化する関数
+# 材料を長さの降順に並べ、必要数量を最大公約数で割った基本キットと倍数に分解する
+def canonicalize_order(total_length, lengths, required_quantities, settings):
+    order = sorted(range(len(lengths)), key=lambda i: (-lengths[i], required_quantities[i]))
+    canonical_lengths = [lengths[i] for i in order]
+    # 整数値の数量は int に揃え、整数でない数量を含む場合は倍数への分解を行わない
+    canonical_quantities = [int(q) if q == int(q) else q for q in (required_quantities[i] for i in order)]
+    if all(isinstance(q, int) for q in canonical_quantities):
+        multiplier = math.gcd(*canonical_quantities) or 1
+    else:
+        multiplier = 1
+    base_quantities = [q // multiplier for q in canonical_quantities] if multiplier > 1 else canonical_quantities
+    payload = json.dumps([total_length, canonical_lengths, base_quantities, settings], sort_keys=True)
+    base_key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return base_key, multiplier, order
+
+# 正規化した順序のパターンを元の材料順に戻す関数
+def restore_pattern_counts(canonical_counts, order):
+    pattern_counts = {}
+    for canonical_pattern, count in canonical_counts:
+        pattern = [0] * len(order)
+        for k, i in enumerate(order):
+            pattern[i] = canonical_pattern[k]
+        pattern_counts[tuple(pattern)] = count
+    return pattern_counts
+
+# 元の材料順のパターンを正規化した順序に変換する関数
+def canonicalize_pattern_counts(pattern_counts, order):
+    return [[[pattern[i] for i in order], count] for pattern, count in pattern_counts.items()]
+
+def plan_cache_path(base_key):
+    return os.path.join(PLAN_CACHE_DIR, f"{base_key}.json")
+
+# ディスクキャッシュから基本キットの計画一覧（倍数 -> 計画）を読み込む関数
+def load_cached_plans(base_key):
+    path = plan_cache_path(base_key)
+    # 読み込めない・形式の異なるキャッシュファイルはキャッシュなしとして扱う
+    try:
+        with open(path, encoding="utf-8") as f:
+            plans = json.load(f)
+        plans = {int(m): plan for m, plan in plans.items()}
+        if not all(isinstance(plan, list) and len(plan) == 2 for plan in plans.values()):
+            return {}
+        os.utime(path)  # 最終利用時刻を更新（削除順の判定に使用）
+    except (OSError, ValueError, TypeError, AttributeError):
+        return {}
+    return plans
+
+# ディスクキャッシュが上限サイズを超えた場合、利用時刻の古いファイルから削除する関数
+def evict_plan_cache():
+    # 書き込み中の一時ファイルは対象外とし、他のプロセスが先に削除したファイルは無視する
+    entries = []
+    for name in os.listdir(PLAN_CACHE_DIR):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(PLAN_CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= PLAN_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
+
+def store_cached_plan(base_key, multiplier, canonical_plan):
+    os.makedirs(PLAN_CACHE_DIR, exist_ok=True)
+    plans = load_cached_plans(base_key)
+    plans[multiplier] = canonical_plan
+    path = plan_cache_path(base_key)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=PLAN_CACHE_DIR, suffix=".tmp", delete=False) as f:
+        try:
+            json.dump({str(m): plan for m, plan in plans.items()}, f)
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+    os.replace(f.name, path)
+    evict_plan_cache()
+
+def remember_plan(memory_key, canonical_plan):
+    plan_cache_memory[memory_key] = canonical_plan
+    plan_cache_memory.move_to_end(memory_key)
+    if len(plan_cache_memory) > PLAN_CACHE_MEMORY_SIZE:
+        plan_cache_memory.popitem(last=False)
+
+# 母材枚数最小化とパターン数削減の最適化を実行する関数
+# 戻り値: 初期解のパターン利用回数, 最終解のパターン利用回数, 初期解導出時間, 最終的な最適化処理時間,
+#         ステップ1のステータス, ウォームスタートを適用したかどうか
+def solve_cutting_plan(L, lengths, required_quantities, warm_start_counts=None):
+    N = OBJECTIVE_SETTINGS["max_raw_materials"]
+
+    # ステップ1: 母材枚数最小化問題の定義
+    prob1 = pulp.LpProblem("Minimize_Number_of_Raw_Materials", pulp.LpMinimize)
 
     # 変数の定義
-    z = pulp.LpVariable.dicts("z", (h for h in range(len(used_patterns))), lowBound=0, cat='Integer')
-    w = pulp.LpVariable.dicts("w", (h for h in range(len(used_patterns))), cat='Binary')
+    x = pulp.LpVariable.dicts("x", ((i, j) for i in range(len(lengths)) for j in range(N)), lowBound=0, cat='Integer')
+    y = pulp.LpVariable.dicts("y", (j for j in range(N)), cat='Binary')
 
     # 目的関数の設定
-    prob2 += pulp.lpSum([z[h] for h in range(len(used_patterns))]), "Minimize_Total_Raw_Materials_with_Limited_Patterns"
-
-    # 制約1: 切り出し要求を満たす
-    for j in range(len(lengths)):
-        prob2 += pulp.lpSum([z[h] * used_patterns[h][j] for h in range(len(used_patterns))]) >= required_quantities[j], f"Demand_Constraint_{j}_Step2"
-
-    # 制約2: パターンを使用するかどうか
-    M = 1000  # 十分大きな定数
-    for h in range(len(used_patterns)):
-        prob2 += w[h] <= z[h], f"Pattern_Usage_Constraint_1_{h}"
-        prob2 += z[h] <= M * w[h], f"Pattern_Usage_Constraint_2_{h}"
-
-    # 制約3: 使用するパターン数の上限
-    prob2 += pulp.lpSum([w[h] for h in range(len(used_patterns))]) <= k, "Pattern_Limit_Constraint"
-
-    # 最適化実行
-    start_time_step2 = time.time()
-    prob2.solve(pulp.PULP_CBC_CMD(msg=True))
-    end_time_step2 = time.time()
-
-    # 最適化結果のステータスが "Optimal" でない場合、処理を終了
-    if pulp.LpStatus[prob2.status] != "Optimal":
-        print(f"最適解が導出できなくなりました。最適化処理を終了します。")
-        break
-
-    # ステップ2の結果の出力
-    final_pattern_counts = {}
-    total_waste_length_final = 0
-    total_cut_material_length_final = 0
-
-    # 検算用の最適解での切り出し結果
-    cut_materials_final = [0] * len(lengths)
-
-    print(f"\nステータス (ステップ2): {pulp.LpStatus[prob2.status]}")
-    for h in range(len(used_patterns)):
-        if w[h].varValue > 0:
-            pattern = used_patterns[h]
-            count = int(z[h].varValue)
-            if count > 0:  # countが0より大きいときのみ処理
-                final_pattern_counts[pattern] = count
-                waste_length = calculate_waste(pattern, lengths, L)
-                total_waste_length_final += waste_length * count
-                total_cut_material_length_final += sum(pattern[i] * lengths[i] for i in range(len(pattern))) * count
-
-                # 検算のため、切り出された材料の数量を集計
+    prob1 += pulp.lpSum([y[j] for j in range(N)]), "Minimize_Total_Raw_Materials"
+
+    # 制約1: 各材料の要求本数を満たす
+    for i in range(len(lengths)):
+        prob1 += pulp.lpSum([x[(i, j)] for j in range(N)]) >= required_quantities[i], f"Demand_Constraint_{i}"
+
+    # 制約2: 母材の長さ制約
+    for j in range(N):
+        prob1 += pulp.lpSum([lengths[i] * x[(i, j)] for i in range(len(lengths))]) <= L * y[j], f"Length_Constraint_{j}"
+
+    # 倍数の注文の計画が得られている場合、初期解（ウォームスタート）と母材数の上限として利用
+    use_warm_start = False
+    if warm_start_counts:
+        prob1 += pulp.lpSum([y[j] for j in range(N)]) <= sum(warm_start_counts.values()), "Warm_Start_Bound"
+        if sum(warm_start_counts.values()) <= N:
+            j = 0
+            for pattern, count in warm_start_counts.items():
+                for _ in range(count):
+                    y[j].setInitialValue(1)
+                    for i in range(len(lengths)):
+                        x[(i, j)].setInitialValue(pattern[i])
+                    j += 1
+            for j in range(j, N):
+                y[j].setInitialValue(0)
                 for i in range(len(lengths)):
-                    cut_materials_final[i] += pattern[i] * count
+                    x[(i, j)].setInitialValue(0)
+            use_warm_start = True
+
+    # 初期解の導出時間を計測
+    start_time_initial = time.time()
+    prob1.solve(pulp.PULP_CBC_CMD(msg=True, warmStart=use_warm_start))  # CBCソルバーを使用
+    end_time_initial = time.time()
+
+    # ステップ1の結果の出力
+    used_patterns = []
+    pattern_counts = {}
+
+    # 初期解のパターンと利用回数を集計
+    for j in range(N):
+        if y[j].varValue > 0:
+            pattern = tuple(int(x[(i, j)].varValue) for i in range(len(lengths)))
+            if pattern in pattern_counts:
+                pattern_counts[pattern] += 1
+            else:
+                pattern_counts[pattern] = 1
+                used_patterns.append(pattern)
+
+    # 最も少ない母材数と端材長さを保存する変数
+    best_material_count = float('inf')
+    best_waste_length = float('inf')
+    best_pattern_counts = {}
+
+    # パターン数の上限を初期解から段階的に減らしていく
+    start_time_final_optimization = time.time()  # 最終解の最適化プロセス開始時間
+    for k in range(len(used_patterns), 0, -1):
+        print(f"\n\nパターン数の上限を {k} に設定して最適化を実行中...")
+
+        # 新しい問題の定義 (ステップ2: パターン数制限付き最適化)
+        prob2 = pulp.LpProblem(f"Minimize_Number_of_Raw_Materials_with_Limited_Patterns_k={k}", pulp.LpMinimize)
+
+        # 変数の定義
+        z = pulp.LpVariable.dicts("z", (h for h in range(len(used_patterns))), lowBound=0, cat='Integer')
+        w = pulp.LpVariable.dicts("w", (h for h in range(len(used_patterns))), cat='Binary')
+
+        # 目的関数の設定
+        prob2 += pulp.lpSum([z[h] for h in range(len(used_patterns))]), "Minimize_Total_Raw_Materials_with_Limited_Patterns"
+
+        # 制約1: 切り出し要求を満たす
+        for j in range(len(lengths)):
+            prob2 += pulp.lpSum([z[h] * used_patterns[h][j] for h in range(len(used_patterns))]) >= required_quantities[j], f"Demand_Constraint_{j}_Step2"
+
+        # 制約2: パターンを使用するかどうか
+        M = OBJECTIVE_SETTINGS["pattern_big_m"]  # 十分大きな定数
+        for h in range(len(used_patterns)):
+            prob2 += w[h] <= z[h], f"Pattern_Usage_Constraint_1_{h}"
+            prob2 += z[h] <= M * w[h], f"Pattern_Usage_Constraint_2_{h}"
+
+        # 制約3: 使用するパターン数の上限
+        prob2 += pulp.lpSum([w[h] for h in range(len(used_patterns))]) <= k, "Pattern_Limit_Constraint"
+
+        # 最適化実行
+        start_time_step2 = time.time()
+        prob2.solve(pulp.PULP_CBC_CMD(msg=True))
+        end_time_step2 = time.time()
+
+        # 最適化結果のステータスが "Optimal" でない場合、処理を終了
+        if pulp.LpStatus[prob2.status] != "Optimal":
+            print(f"最適解が導出できなくなりました。最適化処理を終了します。")
+            break
+
+        # ステップ2の結果の出力
+        final_pattern_counts = {}
+        total_waste_length_final = 0
+        total_cut_material_length_final = 0
+
+        # 検算用の最適解での切り出し結果
+        cut_materials_final = [0] * len(lengths)
+
+        print(f"\nステータス (ステップ2): {pulp.LpStatus[prob2.status]}")
+        for h in range(len(used_patterns)):
+            if w[h].varValue > 0:
+                pattern = used_patterns[h]
+                count = int(z[h].varValue)
+                if count > 0:  # countが0より大きいときのみ処理
+                    final_pattern_counts[pattern] = count
+                    waste_length = calculate_waste(pattern, lengths, L)
+                    total_waste_length_final += waste_length * count
+                    total_cut_material_length_final += sum(pattern[i] * lengths[i] for i in range(len(pattern))) * count
+
+                    # 検算のため、切り出された材料の数量を集計
+                    for i in range(len(lengths)):
+                        cut_materials_final[i] += pattern[i] * count
+
+        # 余分な切断材料の総長さ（最適解）
+        total_excess_cut_material_length_final = calculate_excess_material(cut_materials_final, required_quantities, lengths)
+
+        # 最適解が得られた場合、最も少ない母材数と端材長さを保存
+        if sum(final_pattern_counts.values()) < best_material_count or (sum(final_pattern_counts.values()) == best_material_count and total_waste_length_final < best_waste_length):
+            best_material_count = sum(final_pattern_counts.values())
+            best_waste_length = total_waste_length_final
+            best_pattern_counts = final_pattern_counts
+
+        print(f"\n最適解で導出された切り出しパターンとその利用回数:")
+        for pattern, count in final_pattern_counts.items():
+            waste_length = calculate_waste(pattern, lengths, L)
+            print(f"パターン {pattern}: {count} 回使用, 端材の長さ: {waste_length} mm")
+
+        # 最終的な使用母材数と端材の長さを表示
+        print(f"\n最終的な使用母材数: {sum(final_pattern_counts.values())}")
+        print(f"最終的な総端材の長さ: {total_waste_length_final} mm")
+        print(f"余分な切断材料の総長さ: {total_excess_cut_material_length_final} mm")
+        print(f"ステップ2の計算時間: {end_time_step2 - start_time_step2:.2f} 秒")
+
+    end_time_final_optimization = time.time()
+
+    return pattern_counts, best_pattern_counts, end_time_initial - start_time_initial, end_time_final_optimization - start_time_final_optimization, pulp.LpStatus[prob1.status], use_warm_start
+
+# キャッシュを参照し、なければ最適化を実行して計画を取得する関数
+def get_cutting_plan(L, lengths, required_quantities):
+    base_key, multiplier, order = canonicalize_order(L, lengths, required_quantities, OBJECTIVE_SETTINGS)
+    memory_key = (base_key, multiplier)
+
+    # メモリ上のLRUキャッシュ
+    if memory_key in plan_cache_memory:
+        plan_cache_memory.move_to_end(memory_key)
+        initial_plan, best_plan = plan_cache_memory[memory_key]
+        return restore_pattern_counts(initial_plan, order), restore_pattern_counts(best_plan, order), 0.0, 0.0, "memory"
+
+    # ディスクキャッシュ
+    cached_plans = load_cached_plans(base_key)
+    if multiplier in cached_plans:
+        initial_plan, best_plan = cached_plans[multiplier]
+        remember_plan(memory_key, (initial_plan, best_plan))
+        return restore_pattern_counts(initial_plan, order), restore_pattern_counts(best_plan, order), 0.0, 0.0, "disk"
+
+    # 同じ基本キットの約数倍の計画があれば、倍にしてウォームスタートに利用
+    warm_start_counts = None
+    divisors = [m for m in cached_plans if multiplier % m == 0]
+    if divisors:
+        base_multiplier = max(divisors)
+        scale = multiplier // base_multiplier
+        _, best_plan = cached_plans[base_multiplier]
+        warm_start_counts = {pattern: count * scale for pattern, count in restore_pattern_counts(best_plan, order).items()}
+
+    pattern_counts, best_pattern_counts, initial_time, final_time, initial_status, used_warm_start = solve_cutting_plan(L, lengths, required_quantities, warm_start_counts)
+    plan_source = "warm_start" if used_warm_start else "solved"
+
+    # 最適解が得られなかった計画はキャッシュしない
+    if initial_status != "Optimal" or not best_pattern_counts:
+        return pattern_counts, best_pattern_counts, initial_time, final_time, plan_source + " (not cached)"
+
+    canonical_plan = (canonicalize_pattern_counts(pattern_counts, order), canonicalize_pattern_counts(best_pattern_counts, order))
+    store_cached_plan(base_key, multiplier, canonical_plan)
+    remember_plan(memory_key, canonical_plan)
+    return pattern_counts, best_pattern_counts, initial_time, final_time, plan_source
+
+if __name__ == "__main__":
+    # 必要数量の生成
+    required_quantities = generate_required_quantities()
+
+    pattern_counts, best_pattern_counts, initial_time, final_time, plan_source = get_cutting_plan(L, lengths, required_quantities)
+
+    # 初期解の集計
+    initial_material_count, total_waste_length, cut_materials_initial, total_excess_cut_material_length_initial = summarize_pattern_counts(pattern_counts, required_quantities, lengths, L)
+    used_patterns = list(pattern_counts)
+
+    # 最終解の集計
+    best_material_count, best_waste_length, best_cut_materials_final, best_excess_cut_material_length = summarize_pattern_counts(best_pattern_counts, required_quantities, lengths, L)
+
+    # 初期解の出力
+    print(f"\n\n--- 初期解 ---")
+    print(f"初期の使用母材数: {initial_material_count}")
+    print(f"初期の利用パターン数: {len(used_patterns)}")
+    print(f"初期の総端材の長さ: {total_waste_length} mm")
+    print(f"余分な切断材料の総長さ: {total_excess_cut_material_length_initial} mm")
+
+    print("\n初期解で導出された切り出しパターンとその利用回数:")
+    for pattern, count in pattern_counts.items():
+        waste_length = calculate_waste(pattern, lengths, L)
+        print(f"パターン {pattern}: {count} 回使用, 端材の長さ: {waste_length} mm")
 
-    # 余分な切断材料の総長さ（最適解）
-    total_excess_cut_material_length_final = calculate_excess_material(cut_materials_final, required_quantities, lengths)
+    print("\n初期解の検算結果:")
+    for i in range(len(lengths)):
+        print(f"材料 {lengths[i]}mm: 必要数量 = {required_quantities[i]}個, 実際に切り出された数量 = {cut_materials_initial[i]}個")
 
-    # 最適解が得られた場合、最も少ない母材数と端材長さを保存
-    if sum(final_pattern_counts.values()) < best_material_count or (sum(final_pattern_counts.values()) == best_material_count and total_waste_length_final < best_waste_length):
-        best_material_count = sum(final_pattern_counts.values())
-        best_waste_length = total_waste_length_final
-        best_pattern_counts = final_pattern_counts
-        best_cut_materials_final = cut_materials_final.copy()
-        best_excess_cut_material_length = total_excess_cut_material_length_final
+    # 最終的な最適解の出力
+    print(f"\n\n--- 最終的な最適解 ---")
+    print(f"最終的な使用母材数: {best_material_count}")
+    print(f"最終的な利用パターン数: {len(best_pattern_counts)}")
+    print(f"最終的な総端材の長さ: {best_waste_length} mm")
+    print(f"余分な切断材料の総長さ: {best_excess_cut_material_length} mm")
 
-    print(f"\n最適解で導出された切り出しパターンとその利用回数:")
-    for pattern, count in final_pattern_counts.items():
+    print(f"\n最終的な最適解で導出された切り出しパターンとその利用回数:")
+    for pattern, count in best_pattern_counts.items():
         waste_length = calculate_waste(pattern, lengths, L)
         print(f"パターン {pattern}: {count} 回使用, 端材の長さ: {waste_length} mm")
 
-    # 最終的な使用母材数と端材の長さを表示
-    print(f"\n最終的な使用母材数: {sum(final_pattern_counts.values())}")
-    print(f"最終的な総端材の長さ: {total_waste_length_final} mm")
-    print(f"余分な切断材料の総長さ: {total_excess_cut_material_length_final} mm")
-    print(f"ステップ2の計算時間: {end_time_step2 - start_time_step2:.2f} 秒")
-
-end_time_final_optimization = time.time()
-
-# 初期解の出力
-print(f"\n\n--- 初期解 ---")
-print(f"初期の使用母材数: {initial_material_count}")
-print(f"初期の利用パターン数: {len(used_patterns)}")
-print(f"初期の総端材の長さ: {total_waste_length} mm")
-print(f"余分な切断材料の総長さ: {total_excess_cut_material_length_initial} mm")
-
-print("\n初期解で導出された切り出しパターンとその利用回数:")
-for pattern, count in pattern_counts.items():
-    waste_length = calculate_waste(pattern, lengths, L)
-    print(f"パターン {pattern}: {count} 回使用, 端材の長さ: {waste_length} mm")
-
-print("\n初期解の検算結果:")
-for i in range(len(lengths)):
-    print(f"材料 {lengths[i]}mm: 必要数量 = {required_quantities[i]}個, 実際に切り出された数量 = {cut_materials_initial[i]}個")
-
-# 最終的な最適解の出力
-print(f"\n\n--- 最終的な最適解 ---")
-print(f"最終的な使用母材数: {best_material_count}")
-print(f"最終的な利用パターン数: {len(best_pattern_counts)}")
-print(f"最終的な総端材の長さ: {best_waste_length} mm")
-print(f"余分な切断材料の総長さ: {best_excess_cut_material_length} mm")
-
-print(f"\n最終的な最適解で導出された切り出しパターンとその利用回数:")
-for pattern, count in best_pattern_counts.items():
-    waste_length = calculate_waste(pattern, lengths, L)
-    print(f"パターン {pattern}: {count} 回使用, 端材の長さ: {waste_length} mm")
-
-print("\n最適解の検算結果:")
-for i in range(len(lengths)):
-    print(f"材料 {lengths[i]}mm: 必要数量 = {required_quantities[i]}個, 実際に切り出された数量 = {best_cut_materials_final[i]}個")
-
-# 処理時間の出力
-print(f"\n\n--- 処理時間 ---")
-print(f"初期解導出時間: {end_time_initial - start_time_initial:.2f} 秒")
-print(f"最終的な最適化処理時間: {end_time_final_optimization - start_time_final_optimization:.2f} 秒")
+    print("\n最適解の検算結果:")
+    for i in range(len(lengths)):
+        print(f"材料 {lengths[i]}mm: 必要数量 = {required_quantities[i]}個, 実際に切り出された数量 = {best_cut_materials_final[i]}個")
+
+    # 処理時間の出力
+    print(f"\n\n--- 処理時間 ---")
+    print(f"計画の取得元: {plan_source}")
+    print(f"初期解導出時間: {initial_time:.2f} 秒")
+    print(f"最終的な最適化処理時間: {final_time:.2f} 秒")
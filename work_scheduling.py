@@ -5,6 +5,7 @@ import random
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import warnings
 
 # 問題の定義
 prob = LpProblem("Shift_Scheduling", LpMaximize)
@@ -14,6 +15,22 @@ N = 9   # 従業員数
 T = 30  # 日数
 M = 1   # 月数
 
+# 出力設定
+OUTPUT_FORMAT = 'parquet'    # 'parquet'（pyarrowが必要）または 'csv'
+OUTPUT_BATCH_EMPLOYEES = 1000  # ファイルへ書き出す際の1ブロックあたりの従業員数
+PRINT_SCHEDULE = False       # Trueにすると勤務表をコンソールに表示
+
+# 出力設定の確認（時間のかかる求解の前に行う）
+if OUTPUT_FORMAT not in ('parquet', 'csv'):
+    raise ValueError(f"OUTPUT_FORMAT は 'parquet' または 'csv' を指定してください: {OUTPUT_FORMAT!r}")
+if OUTPUT_FORMAT == 'parquet':
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        warnings.warn("pyarrow がインストールされていないため、CSV形式で出力します。")
+        OUTPUT_FORMAT = 'csv'
+
 # インデックスの定義
 I = range(1, N+1)        # 従業員のインデックス
 T_range = range(1, T+1)  # 日数のインデックス
@@ -209,43 +226,66 @@ solver = SCIP_CMD("C:\\Program Files\\SCIPOptSuite 9.1.0\\bin\\scip.exe")
 prob.solve(solver)
 
 # 結果の収集
-results = []
-
-for i in I:
-    for t in T_range:
-        if value(d[i][t]) == 1:
-            shift = '昼勤務'
-        elif value(n[i][t]) == 1:
-            shift = '夜勤務'
-        else:
-            shift = '休み'
-        labor_hours = value(h[i][t])
-        overtime_hours = value(r[i][t])
-        results.append({
-            '従業員ID': i,
-            '従業員名': f'従業員{i}',
-            '日付': t,
-            'シフト': shift,
-            '労働時間': labor_hours,
-            '時間外労働時間': overtime_hours
-        })
-
-# データフレームに変換
-df_results = pd.DataFrame(results)
-
-# CSVに出力
-df_results.to_csv('shift_schedule.csv', index=False, encoding='utf-8-sig')
+# 解の値を変数ごとに一度だけ読み出し、従業員×日付の配列に格納する
+# （以降の集計・出力・表示はすべてこの配列から行う）
+d_values = np.array([[d[i][t].varValue or 0.0 for t in T_range] for i in I])
+n_values = np.array([[n[i][t].varValue or 0.0 for t in T_range] for i in I])
+h_values = np.array([[h[i][t].varValue or 0.0 for t in T_range] for i in I])
+r_values = np.array([[r[i][t].varValue or 0.0 for t in T_range] for i in I])
+
+# シフトコード（0: 休み, 1: 昼勤務, 2: 夜勤務）
+shift_labels = np.array(['休み', '昼勤務', '夜勤務'])
+shift_codes = np.where(d_values > 0.5, 1, np.where(n_values > 0.5, 2, 0))
+
+# 休みの日は労働時間・時間外労働時間を0とする
+is_working = shift_codes > 0
+labor_hours = np.where(is_working, h_values, 0.0)
+overtime_hours = np.where(is_working, r_values, 0.0)
+
+# 従業員のブロックごとに列形式のデータフレームを作成
+employee_array = np.array(list(I))
+day_array = np.array(list(T_range))
+
+def result_block(start, stop):
+    employee_ids = np.repeat(employee_array[start:stop], T)
+    return pd.DataFrame({
+        '従業員ID': employee_ids,
+        '従業員名': [f'従業員{i}' for i in employee_ids],
+        '日付': np.tile(day_array, stop - start),
+        'シフト': shift_labels[shift_codes[start:stop].ravel()],
+        '労働時間': labor_hours[start:stop].ravel(),
+        '時間外労働時間': overtime_hours[start:stop].ravel()
+    })
+
+# ファイルに出力（全体をまとめず、従業員のブロックごとに書き出す）
+block_starts = range(0, N, OUTPUT_BATCH_EMPLOYEES)
+if OUTPUT_FORMAT == 'parquet':
+    result_schema = pa.schema([
+        ('従業員ID', pa.int64()),
+        ('従業員名', pa.string()),
+        ('日付', pa.int64()),
+        ('シフト', pa.string()),
+        ('労働時間', pa.float64()),
+        ('時間外労働時間', pa.float64())
+    ])
+    with pq.ParquetWriter('shift_schedule.parquet', result_schema) as writer:
+        for start in block_starts:
+            block = result_block(start, min(start + OUTPUT_BATCH_EMPLOYEES, N))
+            writer.write_table(pa.Table.from_pandas(block, schema=result_schema, preserve_index=False))
+else:
+    with open('shift_schedule.csv', 'w', encoding='utf-8-sig', newline='') as csv_file:
+        for start in block_starts:
+            result_block(start, min(start + OUTPUT_BATCH_EMPLOYEES, N)).to_csv(csv_file, index=False, header=(start == 0))
 
 # 勤務表として可視化
 
 # フォントの設定（Windows環境に合わせて修正）
 plt.rcParams['font.family'] = 'Meiryo'  # または 'Yu Gothic'
 
-pivot_table = df_results.pivot(index='従業員名', columns='日付', values='シフト')
-
-# 可視化のためのマッピング
-shift_mapping = {'昼勤務': 1, '夜勤務': 2, '休み': 0}
-pivot_table_numeric = pivot_table.replace(shift_mapping)
+# 配列から直接勤務表を作成（0: 休み, 1: 昼勤務, 2: 夜勤務）
+employee_names = [f'従業員{i}' for i in I]
+pivot_table = pd.DataFrame(shift_labels[shift_codes], index=employee_names, columns=list(T_range))
+pivot_table_numeric = pd.DataFrame(shift_codes, index=employee_names, columns=list(T_range))
 
 plt.figure(figsize=(20, 6))
 sns.heatmap(pivot_table_numeric, annot=pivot_table, fmt='', cmap='YlGnBu', cbar=False)
@@ -260,21 +300,12 @@ plt.savefig('shift_schedule.png')
 # 結果の表示
 print("Status:", LpStatus[prob.status])
 
-for i in I:
-    print(f'従業員 {i}: 生産性 {p_i[i]:.2f}')
-    for t in T_range:
-        shift = '休み'
-        if value(d[i][t]) == 1:
-            shift = '昼勤務'
-        elif value(n[i][t]) == 1:
-            shift = '夜勤務'
-        if shift == '休み':
-            labor_hours = 0.00
-            overtime_hours = 0.00
-        else:
-            labor_hours = value(h[i][t])
-            overtime_hours = value(r[i][t])
-        print(f'  日 {t}: {shift}, 労働時間: {labor_hours:.2f} 時間, 時間外: {overtime_hours:.2f} 時間')
-    print('-----------------------------------')
+if PRINT_SCHEDULE:
+    for idx, i in enumerate(I):
+        print(f'従業員 {i}: 生産性 {p_i[i]:.2f}')
+        for t_idx, t in enumerate(T_range):
+            shift = shift_labels[shift_codes[idx, t_idx]]
+            print(f'  日 {t}: {shift}, 労働時間: {labor_hours[idx, t_idx]:.2f} 時間, 時間外: {overtime_hours[idx, t_idx]:.2f} 時間')
+        print('-----------------------------------')
 
 print(f'総利益: {value(prob.objective):.2f} 円')